@@ -13,9 +13,14 @@ PROCESSED_DATA_DIR = DATA_DIR / "processed"
 CHECKPOINT_DIR = DATA_DIR / "checkpoints"
 LOGS_DIR = BASE_DIR / "logs"
 
-# Create directories if they don't exist
-for directory in [DATA_DIR, RAW_DATA_DIR, PROCESSED_DATA_DIR, CHECKPOINT_DIR, LOGS_DIR]:
-    directory.mkdir(parents=True, exist_ok=True)
+_DIRS = [DATA_DIR, RAW_DATA_DIR, PROCESSED_DATA_DIR, CHECKPOINT_DIR, LOGS_DIR]
+
+
+def ensure_dirs():
+    """Create the data and log directories if they don't exist"""
+    for directory in _DIRS:
+        directory.mkdir(parents=True, exist_ok=True)
+
 
 # Jira configuration
 JIRA_BASE_URL = "https://issues.apache.org/jira"
@@ -38,6 +43,10 @@ RETRY_BACKOFF_FACTOR = 2  # Exponential backoff: 1, 2, 4, 8, 16 seconds
 RATE_LIMIT_CALLS = 50
 RATE_LIMIT_PERIOD = 60  # seconds
 
+# Concurrency configuration
+MAX_CONCURRENT_REQUESTS = 8  # Search pages fetched in flight at once
+MAX_PARALLEL_PROJECTS = 3  # Projects scraped at once, each in its own process
+
 # Processing configuration
 BATCH_SIZE = 100  # Number of issues to process before saving checkpoint
 MAX_COMMENT_LENGTH = 10000  # Truncate very long comments
@@ -45,9 +54,13 @@ MAX_DESCRIPTION_LENGTH = 20000  # Truncate very long descriptions
 
 # Checkpoint configuration
 SAVE_CHECKPOINT_EVERY = 50  # Save checkpoint every N issues
+CHECKPOINT_FLUSH_INTERVAL = 5  # Seconds between background checkpoint file writes
+INCREMENTAL_OVERLAP_HOURS = 24  # Incremental runs re-fetch this much before the last update seen (covers timezone skew)
 CHECKPOINT_FILE_PATTERN = "checkpoint_{project}_{timestamp}.json"
+ISSUE_DB_FILE_PATTERN = "{project}_issues.db"  # SQLite store of scraped issues
 
 # Output configuration
+RAW_FILE_PATTERN = "{project}_raw.jsonl"
 OUTPUT_FILE_PATTERN = "{project}_issues.jsonl"
 FINAL_OUTPUT_FILE = "apache_jira_corpus.jsonl"
 
@@ -64,14 +77,13 @@ HEADERS = {
     "Content-Type": "application/json"
 }
 
-# Fields to extract from Jira API
+# Fields to extract from Jira API (only those read by JiraScraper._extract_issue_data)
 JIRA_FIELDS = [
     "summary",
     "description",
     "status",
     "priority",
     "issuetype",
-    "project",
     "reporter",
     "assignee",
     "created",
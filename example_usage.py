@@ -8,9 +8,11 @@ This script demonstrates:
 """
 
 import json
-import jsonlines
+from collections import Counter
 from pathlib import Path
 
+import orjson
+
 import config
 from scraper import JiraScraper
 from transformer import DataTransformer
@@ -25,16 +27,16 @@ def example_1_scrape_single_project():
     print("Example 1: Scrape Single Project")
     print("=" * 80)
     
+    config.ensure_dirs()
+    
     # Initialize scraper
     scraper = JiraScraper("KAFKA")
     
-    # Scrape issues
-    issues = scraper.scrape_all_issues()
+    # Scrape issues (raw data is saved to disk as issues arrive)
+    issues = list(scraper.scrape_all_issues())
     
     print(f"Scraped {len(issues)} issues")
-    
-    # Save raw data
-    scraper.save_raw_data(issues)
+    print(f"Raw data saved to: {scraper.raw_file}")
     
     return issues
 
@@ -47,21 +49,20 @@ def example_2_transform_data():
     print("Example 2: Transform Data")
     print("=" * 80)
     
+    config.ensure_dirs()
+    
     # Load raw data
-    raw_file = config.RAW_DATA_DIR / "KAFKA_raw.json"
+    raw_file = config.RAW_DATA_DIR / config.RAW_FILE_PATTERN.format(project="KAFKA")
     
     if not raw_file.exists():
         print("Run example_1 first to scrape data!")
         return
     
-    with open(raw_file, 'r', encoding='utf-8') as f:
-        issues = json.load(f)
-    
     # Initialize transformer
     transformer = DataTransformer("KAFKA")
     
-    # Transform issues
-    training_examples = transformer.transform_all_issues(issues)
+    # Transform issues, streamed from the raw file
+    training_examples = transformer.transform_all_issues(utils.iter_jsonl(raw_file))
     
     print(f"Created {len(training_examples)} training examples")
     
@@ -87,28 +88,29 @@ def example_3_analyze_output():
         print("Run main.py first to create the corpus!")
         return
     
-    examples = []
-    with jsonlines.open(output_file) as reader:
-        for obj in reader:
-            examples.append(obj)
+    # Count by task type in a single streaming pass
+    task_counts = Counter()
+    first_example = None
+    for example in utils.iter_jsonl(output_file):
+        task_counts[example["task_type"]] += 1
+        if first_example is None:
+            first_example = example
     
-    print(f"Total examples: {len(examples)}")
+    total = sum(task_counts.values())
+    print(f"Total examples: {total}")
     
-    # Count by task type
-    task_counts = {}
-    for example in examples:
-        task_type = example["task_type"]
-        task_counts[task_type] = task_counts.get(task_type, 0) + 1
+    if not total:
+        return task_counts
     
     print("\nTask type distribution:")
     for task_type, count in sorted(task_counts.items()):
-        print(f"  {task_type}: {count} ({count/len(examples)*100:.1f}%)")
+        print(f"  {task_type}: {count} ({count/total*100:.1f}%)")
     
     # Show example
     print("\nExample training instance:")
-    print(json.dumps(examples[0], indent=2))
+    print(json.dumps(first_example, indent=2))
     
-    return examples
+    return task_counts
 
 
 def example_4_resume_from_checkpoint():
@@ -119,6 +121,8 @@ def example_4_resume_from_checkpoint():
     print("Example 4: Resume from Checkpoint")
     print("=" * 80)
     
+    config.ensure_dirs()
+    
     # Load checkpoint
     checkpoint = utils.load_checkpoint("KAFKA")
     
@@ -134,7 +138,7 @@ def example_4_resume_from_checkpoint():
     print(f"Resuming from issue {checkpoint['issues_processed']}")
     
     # The scraper automatically loads and uses the checkpoint
-    issues = scraper.scrape_all_issues()
+    issues = list(scraper.scrape_all_issues())
     
     return issues
 
@@ -147,6 +151,8 @@ def example_5_custom_project():
     print("Example 5: Custom Project")
     print("=" * 80)
     
+    config.ensure_dirs()
+    
     # You can scrape any Apache project
     custom_project = "HBASE"  # Change this to any Apache project
     
@@ -155,21 +161,15 @@ def example_5_custom_project():
     # Initialize scraper
     scraper = JiraScraper(custom_project)
     
-    # Scrape issues (will take a while)
-    issues = scraper.scrape_all_issues()
-    
-    # Save raw data
-    scraper.save_raw_data(issues)
-    
-    # Transform data
+    # Scrape and transform issues as they arrive (will take a while)
     transformer = DataTransformer(custom_project)
-    training_examples = transformer.transform_all_issues(issues)
+    training_examples = transformer.transform_all_issues(scraper.scrape_all_issues())
     
     # Save to JSONL
     output_file = config.PROCESSED_DATA_DIR / f"{custom_project.lower()}_issues.jsonl"
     transformer.save_to_jsonl(training_examples, output_file)
     
-    print(f"Custom project complete: {len(issues)} issues, {len(training_examples)} examples")
+    print(f"Custom project complete: {scraper.issues_scraped} issues, {len(training_examples)} examples")
 
 
 def example_6_load_and_filter():
@@ -180,35 +180,42 @@ def example_6_load_and_filter():
     print("Example 6: Load and Filter Data")
     print("=" * 80)
     
+    config.ensure_dirs()
+    
     output_file = config.PROCESSED_DATA_DIR / "apache_jira_corpus.jsonl"
     
     if not output_file.exists():
         print("Run main.py first!")
         return
     
-    # Load all examples
-    examples = []
-    with jsonlines.open(output_file) as reader:
-        for obj in reader:
-            examples.append(obj)
-    
-    # Filter by task type
-    summarization_tasks = [e for e in examples if e["task_type"] == "summarization"]
-    print(f"Summarization tasks: {len(summarization_tasks)}")
-    
-    # Filter by project
-    kafka_examples = [e for e in examples if e["metadata"]["project"] == "KAFKA"]
-    print(f"KAFKA examples: {len(kafka_examples)}")
-    
-    # Filter by priority
-    critical_issues = [e for e in examples if e["metadata"].get("priority") == "Critical"]
-    print(f"Critical issues: {len(critical_issues)}")
+    summarization_count = 0
+    kafka_count = 0
+    critical_count = 0
     
-    # Save filtered subset
+    # Apply all filters in one streaming pass, saving the first 100
+    # summarization tasks as a filtered subset
     filtered_file = config.PROCESSED_DATA_DIR / "filtered_examples.jsonl"
-    with jsonlines.open(filtered_file, mode='w') as writer:
-        for example in summarization_tasks[:100]:  # First 100
-            writer.write(example)
+    with open(filtered_file, 'wb') as writer:
+        for example in utils.iter_jsonl(output_file):
+            metadata = example["metadata"]
+            
+            # Filter by task type
+            if example["task_type"] == "summarization":
+                if summarization_count < 100:
+                    writer.write(orjson.dumps(example) + b"\n")
+                summarization_count += 1
+            
+            # Filter by project
+            if metadata["project"] == "KAFKA":
+                kafka_count += 1
+            
+            # Filter by priority
+            if metadata.get("priority") == "Critical":
+                critical_count += 1
+    
+    print(f"Summarization tasks: {summarization_count}")
+    print(f"KAFKA examples: {kafka_count}")
+    print(f"Critical issues: {critical_count}")
     
     print(f"Saved filtered examples to: {filtered_file}")
 
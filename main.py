@@ -2,22 +2,106 @@
 Main script to run the Apache Jira scraper and data transformation pipeline
 """
 
-import json
+import argparse
 import logging
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
 
 import config
 import utils
 from scraper import JiraScraper
 from transformer import DataTransformer
 
+# Transformers hold no per-project state, so each worker process reuses one
+_transformer = DataTransformer()
+
+
+def run_project(project: str, rate_share: float = 1.0,
+                full: bool = False) -> Optional[Tuple[Path, Dict[str, Any]]]:
+    """
+    Scrape, transform and save a single project
+    
+    Runs in a worker process, so it only takes and returns picklable values.
+    
+    Args:
+        project: Jira project key
+        rate_share: Fraction of the configured rate limit this project may use
+        full: Rescrape every issue instead of only those updated since the last run
+        
+    Returns:
+        Tuple of (output file, project statistics), or None if the project
+        produced no data
+    """
+    logger = logging.getLogger(__name__)
+    logger.info(f"\nProcessing project: {project}")
+    logger.info("-" * 80)
+    
+    try:
+        # Step 1: Scrape data (issues go to the project's issue store as they
+        # arrive and the whole store is exported to the raw file at the end)
+        logger.info(f"[{project}] Starting scraper...")
+        with JiraScraper(project, rate_share=rate_share, full=full) as scraper:
+            for _ in scraper.scrape_all_issues():
+                pass
+        
+        if not scraper.issues_stored:
+            logger.warning(f"[{project}] No issues scraped. Skipping...")
+            return None
+        
+        logger.info(f"[{project}] Raw data saved to: {scraper.raw_file}")
+        
+        # Step 2: Transform data, streamed from the raw file so that issues
+        # kept from earlier or incremental runs are included
+        logger.info(f"[{project}] Starting transformation...")
+        training_examples = _transformer.transform_all_issues(utils.iter_jsonl(scraper.raw_file), project)
+        
+        if not training_examples:
+            logger.warning(f"[{project}] No training examples created. Skipping...")
+            return None
+        
+        # Save transformed data
+        output_file = config.PROCESSED_DATA_DIR / config.OUTPUT_FILE_PATTERN.format(project=project)
+        _transformer.save_to_jsonl(training_examples, output_file)
+        
+        # Generate statistics
+        stats = _transformer.generate_statistics(training_examples)
+        stats["project"] = project
+        stats["raw_issues_count"] = scraper.issues_stored
+        
+        # Statistics are written once, as part of combined_statistics.json
+        logger.info(f"[{project}] Completed successfully!")
+        logger.info(f"[{project}] Issues scraped this run: {scraper.issues_scraped} ({scraper.issues_stored} total)")
+        logger.info(f"[{project}] Training examples created: {len(training_examples)}")
+        
+        return output_file, stats
+        
+    except Exception as e:
+        logger.error(f"[{project}] Error processing project: {str(e)}", exc_info=True)
+        return None
+
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """
     Main execution function
+    
+    Args:
+        argv: Command line arguments (defaults to sys.argv)
     """
+    parser = argparse.ArgumentParser(description="Apache Jira scraper and transformer pipeline")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="rescrape every issue instead of only those updated since the last run"
+    )
+    args = parser.parse_args(argv)
+    
+    config.ensure_dirs()
+    
     # Setup logging
     logger = utils.setup_logging()
     logger.info("=" * 80)
@@ -30,58 +114,26 @@ def main():
     all_statistics = []
     
     try:
-        # Process each project
-        for project in config.PROJECTS:
-            logger.info(f"\nProcessing project: {project}")
-            logger.info("-" * 80)
+        # Process projects in parallel; they share no state, but they do share
+        # the Jira server, so the rate limit is split between them
+        num_workers = min(config.MAX_PARALLEL_PROJECTS, len(config.PROJECTS))
+        rate_share = 1.0 / num_workers
+        
+        with ProcessPoolExecutor(max_workers=num_workers, initializer=utils.setup_logging) as executor:
+            results = executor.map(
+                run_project,
+                config.PROJECTS,
+                [rate_share] * len(config.PROJECTS),
+                [args.full] * len(config.PROJECTS)
+            )
             
-            try:
-                # Step 1: Scrape data
-                logger.info(f"[{project}] Starting scraper...")
-                scraper = JiraScraper(project)
-                issues = scraper.scrape_all_issues()
-                
-                if not issues:
-                    logger.warning(f"[{project}] No issues scraped. Skipping...")
+            for result in results:
+                if result is None:
                     continue
                 
-                # Save raw data
-                raw_file = scraper.save_raw_data(issues)
-                logger.info(f"[{project}] Raw data saved to: {raw_file}")
-                
-                # Step 2: Transform data
-                logger.info(f"[{project}] Starting transformation...")
-                transformer = DataTransformer(project)
-                training_examples = transformer.transform_all_issues(issues)
-                
-                if not training_examples:
-                    logger.warning(f"[{project}] No training examples created. Skipping...")
-                    continue
-                
-                # Save transformed data
-                output_file = config.PROCESSED_DATA_DIR / config.OUTPUT_FILE_PATTERN.format(project=project)
-                transformer.save_to_jsonl(training_examples, output_file)
+                output_file, stats = result
                 all_project_files.append(output_file)
-                
-                # Generate statistics
-                stats = transformer.generate_statistics(training_examples)
-                stats["project"] = project
-                stats["raw_issues_count"] = len(issues)
                 all_statistics.append(stats)
-                
-                # Save project statistics
-                stats_file = config.PROCESSED_DATA_DIR / f"{project}_statistics.json"
-                with open(stats_file, 'w', encoding='utf-8') as f:
-                    json.dump(stats, f, indent=2, ensure_ascii=False)
-                
-                logger.info(f"[{project}] Statistics saved to: {stats_file}")
-                logger.info(f"[{project}] Completed successfully!")
-                logger.info(f"[{project}] Issues scraped: {len(issues)}")
-                logger.info(f"[{project}] Training examples created: {len(training_examples)}")
-                
-            except Exception as e:
-                logger.error(f"[{project}] Error processing project: {str(e)}", exc_info=True)
-                continue
         
         # Step 3: Merge all project files
         if all_project_files:
@@ -106,8 +158,8 @@ def main():
             }
             
             combined_stats_file = config.PROCESSED_DATA_DIR / "combined_statistics.json"
-            with open(combined_stats_file, 'w', encoding='utf-8') as f:
-                json.dump(combined_stats, f, indent=2, ensure_ascii=False)
+            with open(combined_stats_file, 'wb') as f:
+                f.write(orjson.dumps(combined_stats, option=orjson.OPT_INDENT_2))
             
             logger.info(f"Combined statistics saved to: {combined_stats_file}")
             
@@ -2,15 +2,17 @@
 Jira Scraper Module - Handles all data extraction from Apache Jira
 """
 
-import json
 import logging
+import sqlite3
+import threading
 import time
-from typing import Any, Dict, List, Optional
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional
 
+import orjson
 import requests
 from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -22,43 +24,85 @@ from tqdm import tqdm
 import config
 import utils
 
+# Request invariants, built once rather than on every call
+_SEARCH_URL = f"{config.JIRA_API_URL}/search"
+_FIELDS_CSV = ",".join(config.JIRA_FIELDS)
+
+
+def _named(obj: Optional[Dict[str, Any]]) -> str:
+    """Return the name of a Jira object such as a status, or 'Unknown'"""
+    return obj.get("name", "Unknown") if obj else "Unknown"
+
+
+def _names(objs: Optional[List[Dict[str, Any]]]) -> List[str]:
+    """Return the names of a list of Jira objects such as components"""
+    return [obj["name"] for obj in objs or () if "name" in obj]
+
 
 class JiraScraper:
     """
     Main scraper class for Apache Jira
     """
     
-    def __init__(self, project: str):
+    def __init__(self, project: str, rate_share: float = 1.0, full: bool = False):
         """
         Initialize the scraper
         
         Args:
             project: Jira project key (e.g., 'KAFKA')
+            rate_share: Fraction of the configured rate limit this scraper may
+                use, for when several scrapers run in parallel
+            full: Rescrape every issue instead of only those updated since
+                the last completed run
         """
         self.project = project
         self.logger = logging.getLogger(f"{__name__}.{project}")
         self.session = self._create_session()
         self.issues_scraped = 0
+        self.issues_stored = 0
+        self.raw_file = config.RAW_DATA_DIR / config.RAW_FILE_PATTERN.format(project=project)
         self.checkpoint_data = self._load_or_create_checkpoint()
+        self.db = self._open_issue_store()
+        
+        # Resume offset into the project's issue list; it lives here and is
+        # only copied into the checkpoint when one is serialized
+        self.issues_processed = self.checkpoint_data.pop("issues_processed", 0)
+        self.checkpoint_data.pop("last_update", None)
+        self._latest_update = utils.parse_timestamp(self.checkpoint_data.get("last_issue_update"))
+        self._plan_run(full)
+        
+        # Checkpoint files are written by a background flusher; these guard
+        # the pending snapshot it writes and keep writes one at a time
+        self._checkpoint_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending_checkpoint = None
+        
+        # Rate limiter shared by all request threads
+        self._bucket = utils.TokenBucket(
+            rate=config.RATE_LIMIT_CALLS * rate_share / config.RATE_LIMIT_PERIOD,
+            capacity=max(1, int(config.RATE_LIMIT_CALLS * rate_share))
+        )
         
     def _create_session(self) -> requests.Session:
         """
-        Create a requests session with retry logic
+        Create a pooled requests session
+        
+        Retries are left to _make_request, which backs off and honours
+        Retry-After; retrying inside urllib3 as well would multiply the
+        attempts per request.
         
         Returns:
             Configured requests session
         """
         session = requests.Session()
         
-        # Configure retry strategy
-        retry_strategy = Retry(
-            total=config.MAX_RETRIES,
-            backoff_factor=config.RETRY_BACKOFF_FACTOR,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET", "POST"]
+        # One pooled keep-alive connection per worker thread, so concurrent
+        # page fetches reuse TCP/TLS connections instead of reconnecting
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=config.MAX_CONCURRENT_REQUESTS,
+            max_retries=0
         )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         session.headers.update(config.HEADERS)
@@ -75,23 +119,123 @@ class JiraScraper:
         checkpoint = utils.load_checkpoint(self.project)
         
         if checkpoint:
-            self.logger.info(f"Loaded checkpoint for {self.project}: {checkpoint['issues_processed']} issues processed")
+            self.logger.info("Loaded checkpoint for %s: %s issues processed", self.project, checkpoint['issues_processed'])
             return checkpoint
         
         return {
             "project": self.project,
-            "issues_processed": 0,
             "last_issue_key": None,
-            "start_time": datetime.now().isoformat(),
-            "last_update": datetime.now().isoformat()
+            "start_time": time.strftime("%Y-%m-%dT%H:%M:%S")
+        }
+    
+    def _plan_run(self, full: bool):
+        """
+        Decide which issues this run fetches and build its JQL
+        
+        A full run walks every issue in creation order. Once a run has
+        completed, later runs only fetch issues updated since the newest
+        update seen. Both page in creation order, so an issue edited mid-run
+        keeps its position and the startAt offsets of later pages stay valid;
+        an edit never drops an issue out of an "updated >=" filter either. An
+        interrupted run resumes with the query it started with.
+        
+        Args:
+            full: Force a full rescrape, ignoring any checkpoint progress
+        """
+        if full:
+            self.issues_processed = 0
+            self.checkpoint_data["updated_since"] = None
+        elif self.checkpoint_data.get("completed") and self._latest_update:
+            since = self._latest_update - timedelta(hours=config.INCREMENTAL_OVERLAP_HOURS)
+            self.issues_processed = 0
+            self.checkpoint_data["updated_since"] = since.strftime("%Y/%m/%d %H:%M")
+        
+        self.checkpoint_data["completed"] = False
+        updated_since = self.checkpoint_data.get("updated_since")
+        
+        # Refreshing runs overwrite stored issues instead of skipping them
+        self.refresh = full or updated_since is not None
+        
+        self._search_filter = f"project = {self.project}"
+        if updated_since:
+            self._search_filter += f' AND updated >= "{updated_since}"'
+            self.logger.info("Incremental run: issues updated since %s", updated_since)
+        self._search_jql = f"{self._search_filter} ORDER BY created ASC"
+    
+    def _open_issue_store(self) -> sqlite3.Connection:
+        """
+        Open the SQLite store that holds every issue scraped for the project
+        
+        Returns:
+            SQLite connection with the issues table created
+        """
+        db_path = config.CHECKPOINT_DIR / config.ISSUE_DB_FILE_PATTERN.format(project=self.project)
+        db = sqlite3.connect(db_path)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS issues ("
+            "issue_key TEXT PRIMARY KEY, "
+            "payload BLOB NOT NULL)"
+        )
+        db.commit()
+        return db
+    
+    def _load_seen_keys(self) -> FrozenSet[str]:
+        """
+        Load the keys of all issues already in the issue store
+        
+        The query is answered from the primary key index alone, so stored
+        payloads are never read.
+        
+        Returns:
+            Frozen set of stored issue keys
+        """
+        return frozenset(row[0] for row in self.db.execute("SELECT issue_key FROM issues"))
+    
+    def _serialize_checkpoint(self) -> Dict[str, Any]:
+        """
+        Build the checkpoint as written to disk
+        
+        Returns:
+            Checkpoint data including current progress
+        """
+        return {
+            **self.checkpoint_data,
+            "issues_processed": self.issues_processed,
+            "last_update": time.strftime("%Y-%m-%dT%H:%M:%S")
         }
     
     def _save_checkpoint(self):
-        """Save current progress to checkpoint file"""
-        self.checkpoint_data["last_update"] = datetime.now().isoformat()
-        self.checkpoint_data["issues_processed"] = self.issues_scraped
-        utils.save_checkpoint(self.project, self.checkpoint_data)
-        self.logger.info(f"Checkpoint saved: {self.issues_scraped} issues processed")
+        """Snapshot current progress for the next checkpoint file write"""
+        # Commit stored issues first so the checkpoint never gets ahead of them
+        self.db.commit()
+        
+        with self._checkpoint_lock:
+            self._pending_checkpoint = self._serialize_checkpoint()
+    
+    def _flush_checkpoint(self):
+        """Write the checkpoint file if progress changed since the last write"""
+        with self._flush_lock:
+            with self._checkpoint_lock:
+                data = self._pending_checkpoint
+                self._pending_checkpoint = None
+            
+            if data is None:
+                return
+            
+            utils.save_checkpoint(self.project, data)
+        
+        self.logger.info("Checkpoint saved: %s issues processed", data['issues_processed'])
+    
+    def _run_checkpoint_flusher(self, stop: threading.Event):
+        """
+        Flush the checkpoint periodically until stopped
+        
+        Args:
+            stop: Event set when scraping finishes
+        """
+        while not stop.wait(config.CHECKPOINT_FLUSH_INTERVAL):
+            self._flush_checkpoint()
     
     @retry(
         stop=stop_after_attempt(config.MAX_RETRIES),
@@ -112,6 +256,8 @@ class JiraScraper:
         Raises:
             requests.exceptions.RequestException: On request failure
         """
+        self._bucket.acquire()
+        
         try:
             response = self.session.get(
                 url,
@@ -122,26 +268,26 @@ class JiraScraper:
             # Handle rate limiting
             if response.status_code == 429:
                 retry_after = int(response.headers.get('Retry-After', 60))
-                self.logger.warning(f"Rate limited. Waiting {retry_after} seconds...")
+                self.logger.warning("Rate limited. Waiting %s seconds...", retry_after)
                 time.sleep(retry_after)
                 raise requests.exceptions.RequestException("Rate limited")
             
             # Handle server errors
             if response.status_code >= 500:
-                self.logger.error(f"Server error: {response.status_code}")
+                self.logger.error("Server error: %s", response.status_code)
                 raise requests.exceptions.RequestException(f"Server error: {response.status_code}")
             
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
             
         except requests.exceptions.Timeout:
-            self.logger.error(f"Request timeout for URL: {url}")
+            self.logger.error("Request timeout for URL: %s", url)
             raise
         except requests.exceptions.RequestException as e:
-            self.logger.error(f"Request failed: {str(e)}")
+            self.logger.error("Request failed: %s", e)
             raise
-        except json.JSONDecodeError as e:
-            self.logger.error(f"Failed to parse JSON response: {str(e)}")
+        except orjson.JSONDecodeError as e:
+            self.logger.error("Failed to parse JSON response: %s", e)
             raise requests.exceptions.RequestException(f"Invalid JSON response: {str(e)}")
     
     def _search_issues(self, start_at: int = 0) -> Dict[str, Any]:
@@ -154,19 +300,30 @@ class JiraScraper:
         Returns:
             Search results with issues and pagination info
         """
-        url = f"{config.JIRA_API_URL}/search"
-        
-        jql = f"project = {self.project} ORDER BY created ASC"
-        
         params = {
-            "jql": jql,
+            "jql": self._search_jql,
             "startAt": start_at,
             "maxResults": config.MAX_RESULTS_PER_PAGE,
-            "fields": ",".join(config.JIRA_FIELDS)
+            "fields": _FIELDS_CSV
         }
         
-        self.logger.debug(f"Searching issues: startAt={start_at}")
-        return self._make_request(url, params)
+        self.logger.debug("Searching issues: startAt=%s", start_at)
+        return self._make_request(_SEARCH_URL, params)
+    
+    def _get_total(self) -> int:
+        """
+        Get the number of issues in the project without fetching any of them
+        
+        Returns:
+            Total issue count
+        """
+        params = {
+            "jql": self._search_filter,
+            "maxResults": 0,
+            "fields": ""
+        }
+        
+        return self._make_request(_SEARCH_URL, params).get("total", 0)
     
     def _get_issue_details(self, issue_key: str) -> Dict[str, Any]:
         """
@@ -181,8 +338,7 @@ class JiraScraper:
         url = f"{config.JIRA_API_URL}/issue/{issue_key}"
         
         params = {
-            "fields": ",".join(config.JIRA_FIELDS),
-            "expand": "renderedFields"
+            "fields": _FIELDS_CSV
         }
         
         return self._make_request(url, params)
@@ -197,26 +353,42 @@ class JiraScraper:
         Returns:
             Structured issue data
         """
-        fields = issue.get("fields", {})
+        fields = issue.get("fields") or {}
+        issue_key = issue.get("key", "")
+        
+        # Comments (Jira sends null rather than omitting empty fields, hence `or`)
+        comments = []
+        for comment in (fields.get("comment") or {}).get("comments") or ():
+            comment_text = utils.clean_text(
+                comment.get("body"),
+                max_length=config.MAX_COMMENT_LENGTH
+            )
+            
+            if comment_text:
+                comments.append({
+                    "author": utils.extract_user_info(comment.get("author")),
+                    "created": utils.format_timestamp(comment.get("created")),
+                    "body": comment_text
+                })
         
         # Extract basic metadata
         issue_data = {
-            "issue_key": issue.get("key", ""),
+            "issue_key": issue_key,
             "issue_id": issue.get("id", ""),
             "project": self.project,
-            "url": f"{config.JIRA_BASE_URL}/browse/{issue.get('key', '')}",
+            "url": f"{config.JIRA_BASE_URL}/browse/{issue_key}",
             
             # Title and description
-            "title": utils.clean_text(fields.get("summary", "")),
+            "title": utils.clean_text(fields.get("summary")),
             "description": utils.clean_text(
-                fields.get("description", ""),
+                fields.get("description"),
                 max_length=config.MAX_DESCRIPTION_LENGTH
             ),
             
             # Status and priority
-            "status": fields.get("status", {}).get("name", "Unknown"),
-            "priority": fields.get("priority", {}).get("name", "Unknown"),
-            "issue_type": fields.get("issuetype", {}).get("name", "Unknown"),
+            "status": _named(fields.get("status")),
+            "priority": _named(fields.get("priority")),
+            "issue_type": _named(fields.get("issuetype")),
             
             # People
             "reporter": utils.extract_user_info(fields.get("reporter")),
@@ -228,54 +400,51 @@ class JiraScraper:
             "resolved": utils.format_timestamp(fields.get("resolutiondate")),
             
             # Labels and components
-            "labels": fields.get("labels", []),
-            "components": [c.get("name", "") for c in fields.get("components", [])],
-            "versions": [v.get("name", "") for v in fields.get("versions", [])],
-            "fix_versions": [v.get("name", "") for v in fields.get("fixVersions", [])],
+            "labels": fields.get("labels") or [],
+            "components": _names(fields.get("components")),
+            "versions": _names(fields.get("versions")),
+            "fix_versions": _names(fields.get("fixVersions")),
             
             # Comments
-            "comments": []
+            "comments": comments
         }
         
-        # Extract comments
-        comment_data = fields.get("comment", {})
-        comments = comment_data.get("comments", [])
-        
-        for comment in comments:
-            comment_text = utils.clean_text(
-                comment.get("body", ""),
-                max_length=config.MAX_COMMENT_LENGTH
-            )
-            
-            if comment_text:
-                issue_data["comments"].append({
-                    "author": utils.extract_user_info(comment.get("author")),
-                    "created": utils.format_timestamp(comment.get("created")),
-                    "body": comment_text
-                })
-        
         issue_data["comment_count"] = len(issue_data["comments"])
         
         return issue_data
     
-    def scrape_all_issues(self) -> List[Dict[str, Any]]:
+    def scrape_all_issues(self) -> Iterator[Dict[str, Any]]:
         """
         Scrape all issues from the project
         
-        Returns:
-            List of all scraped issues
+        Each issue is written to the project's SQLite issue store as soon as
+        it is extracted, so only the pages in flight are held in memory. The
+        store is exported to the raw JSONL file once the scrape completes.
+        
+        Yields:
+            Structured data for each scraped issue
         """
-        all_issues = []
-        start_at = self.checkpoint_data.get("issues_processed", 0)
+        start_at = self.issues_processed
         
-        self.logger.info(f"Starting scrape for project {self.project} from issue {start_at}")
+        self.logger.info("Starting scrape for project %s from issue %s", self.project, start_at)
+        
+        # Issues stored by earlier runs are skipped, so resuming from a
+        # checkpoint that lags behind the store never duplicates work
+        seen_keys = frozenset() if self.refresh else self._load_seen_keys()
+        
+        stop_flusher = threading.Event()
+        flusher = threading.Thread(
+            target=self._run_checkpoint_flusher,
+            args=(stop_flusher,),
+            daemon=True
+        )
+        flusher.start()
         
         try:
             # Get total count first
-            initial_search = self._search_issues(start_at=0)
-            total_issues = initial_search.get("total", 0)
+            total_issues = self._get_total()
             
-            self.logger.info(f"Total issues to scrape: {total_issues}")
+            self.logger.info("Total issues to scrape: %s", total_issues)
             
             # Progress bar
             pbar = tqdm(
@@ -285,72 +454,97 @@ class JiraScraper:
                 unit="issue"
             )
             
-            while True:
-                # Search for issues
-                search_results = self._search_issues(start_at=start_at)
-                issues = search_results.get("issues", [])
-                
-                if not issues:
-                    break
-                
-                # Process each issue
-                for issue in issues:
-                    try:
-                        # Extract issue data
-                        issue_data = self._extract_issue_data(issue)
-                        all_issues.append(issue_data)
-                        
-                        # Update tracking
-                        self.issues_scraped += 1
-                        self.checkpoint_data["last_issue_key"] = issue_data["issue_key"]
-                        
-                        pbar.update(1)
+            page_offsets = range(start_at, total_issues, config.MAX_RESULTS_PER_PAGE)
+            
+            # Fetch pages concurrently; map() hands them back in order so that
+            # issues_processed in the checkpoint stays a valid resume offset
+            with ThreadPoolExecutor(max_workers=config.MAX_CONCURRENT_REQUESTS) as executor:
+                for search_results in executor.map(self._search_issues, page_offsets):
+                    issues = search_results.get("issues", [])
+                    
+                    # Process each issue
+                    for issue in issues:
+                        self.issues_processed += 1
                         
-                        # Save checkpoint periodically
-                        if self.issues_scraped % config.SAVE_CHECKPOINT_EVERY == 0:
-                            self._save_checkpoint()
+                        if issue.get("key") in seen_keys:
+                            pbar.update(1)
+                            continue
                         
-                        # Small delay to be respectful
-                        time.sleep(0.1)
+                        try:
+                            # Extract issue data
+                            issue_data = self._extract_issue_data(issue)
+                            self.db.execute(
+                                "INSERT INTO issues (issue_key, payload) VALUES (?, ?) "
+                                "ON CONFLICT(issue_key) DO UPDATE SET payload = excluded.payload",
+                                (issue_data["issue_key"], orjson.dumps(issue_data))
+                            )
+                            
+                            # Update tracking
+                            self.issues_scraped += 1
+                            self.checkpoint_data["last_issue_key"] = issue_data["issue_key"]
+                            
+                            updated = utils.parse_timestamp(issue_data["updated"])
+                            if updated and (self._latest_update is None or updated > self._latest_update):
+                                self._latest_update = updated
+                                self.checkpoint_data["last_issue_update"] = issue_data["updated"]
+                            
+                            pbar.update(1)
+                            
+                            # Save checkpoint periodically
+                            if self.issues_scraped % config.SAVE_CHECKPOINT_EVERY == 0:
+                                self._save_checkpoint()
+                            
+                        except Exception as e:
+                            self.logger.error("Error processing issue %s: %s", issue.get('key', 'unknown'), e)
+                            continue
                         
-                    except Exception as e:
-                        self.logger.error(f"Error processing issue {issue.get('key', 'unknown')}: {str(e)}")
-                        continue
-                
-                # Check if we've processed all issues
-                start_at += len(issues)
-                if start_at >= search_results.get("total", 0):
-                    break
+                        yield issue_data
             
             pbar.close()
             
-            # Final checkpoint save
+            # Final checkpoint save; the next run can go incremental
+            self.checkpoint_data["completed"] = True
             self._save_checkpoint()
             
-            self.logger.info(f"Scraping complete for {self.project}: {len(all_issues)} issues scraped")
+            self.logger.info("Scraping complete for %s: %s issues scraped", self.project, self.issues_scraped)
+            self.save_raw_data()
             
         except Exception as e:
-            self.logger.error(f"Fatal error during scraping: {str(e)}")
+            self.logger.error("Fatal error during scraping: %s", e)
             self._save_checkpoint()
             raise
         
-        return all_issues
+        finally:
+            stop_flusher.set()
+            flusher.join()
+            self._flush_checkpoint()
     
-    def save_raw_data(self, issues: List[Dict[str, Any]]) -> str:
+    def save_raw_data(self) -> str:
         """
-        Save raw scraped data to JSON file
+        Export every stored issue, including those from earlier runs, to the
+        raw JSONL file and record how many were written in issues_stored
         
-        Args:
-            issues: List of issue data
-            
         Returns:
             Path to saved file
         """
-        filename = f"{self.project}_raw.json"
-        filepath = config.RAW_DATA_DIR / filename
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(issues, f, indent=2, ensure_ascii=False)
+        self.issues_stored = 0
+        with open(self.raw_file, 'wb') as f:
+            for (payload,) in self.db.execute("SELECT payload FROM issues ORDER BY rowid"):
+                f.write(payload + b'\n')
+                self.issues_stored += 1
         
-        self.logger.info(f"Raw data saved to {filepath} ({utils.get_file_size_mb(filepath):.2f} MB)")
-        return str(filepath)
\ No newline at end of file
+        self.logger.info("Raw data saved to %s (%.2f MB)", self.raw_file, utils.get_file_size_mb(self.raw_file))
+        return str(self.raw_file)
+    
+    def close(self):
+        """Close the issue store and the HTTP session"""
+        self.db.close()
+        self.session.close()
+    
+    def __enter__(self) -> "JiraScraper":
+        """Use the scraper as a context manager that closes it on exit"""
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close the scraper"""
+        self.close()
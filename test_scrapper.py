@@ -21,13 +21,15 @@ from transformer import DataTransformer
 class TestUtils(unittest.TestCase):
     """Test utility functions"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.test_dir = Path(tempfile.mkdtemp())
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures shared by the class"""
+        cls.test_dir = Path(tempfile.mkdtemp())
         
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         """Clean up test fixtures"""
-        shutil.rmtree(self.test_dir, ignore_errors=True)
+        shutil.rmtree(cls.test_dir, ignore_errors=True)
     
     def test_clean_text(self):
         """Test text cleaning"""
@@ -55,6 +57,11 @@ class TestUtils(unittest.TestCase):
         result = utils.extract_user_info(user)
         self.assertEqual(result, "jdoe")
         
+        # Test with an empty display name
+        user = {"displayName": "", "name": "jdoe"}
+        result = utils.extract_user_info(user)
+        self.assertEqual(result, "jdoe")
+        
         # Test with None
         result = utils.extract_user_info(None)
         self.assertEqual(result, "Unknown")
@@ -69,6 +76,20 @@ class TestUtils(unittest.TestCase):
         # Test cap at 60 seconds
         self.assertEqual(utils.calculate_sleep_time(10), 60)
     
+    @patch('utils.time.sleep')
+    def test_token_bucket(self, mock_sleep):
+        """Test token bucket rate limiting"""
+        bucket = utils.TokenBucket(rate=1, capacity=2)
+        
+        # Burst up to capacity without waiting
+        self.assertEqual(bucket.acquire(), 0)
+        self.assertEqual(bucket.acquire(), 0)
+        mock_sleep.assert_not_called()
+        
+        # Empty bucket waits for the next token
+        self.assertGreater(bucket.acquire(), 0)
+        mock_sleep.assert_called_once()
+    
     def test_validate_json_structure(self):
         """Test JSON validation"""
         data = {"field1": "value1", "field2": "value2"}
@@ -83,18 +104,41 @@ class TestUtils(unittest.TestCase):
 class TestJiraScraper(unittest.TestCase):
     """Test Jira scraper functionality"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Set up a temporary directory shared by the class"""
+        cls.class_dir = Path(tempfile.mkdtemp())
+        
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up test fixtures"""
+        shutil.rmtree(cls.class_dir, ignore_errors=True)
+    
     def setUp(self):
         """Set up test fixtures"""
+        # Keep each test's checkpoints, issue store and raw export apart and
+        # out of the data directory
+        self.test_dir = self.class_dir / self._testMethodName
+        self.test_dir.mkdir()
+        for name in ('CHECKPOINT_DIR', 'RAW_DATA_DIR'):
+            patcher = patch.object(config, name, self.test_dir)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        
         self.project = "TEST"
         self.scraper = JiraScraper(self.project)
         
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.scraper.close()
+    
     @patch('scraper.requests.Session.get')
     def test_make_request_success(self, mock_get):
         """Test successful API request"""
         # Mock successful response
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"test": "data"}
+        mock_response.content = b'{"test": "data"}'
         mock_get.return_value = mock_response
         
         result = self.scraper._make_request("http://test.com")
@@ -111,7 +155,13 @@ class TestJiraScraper(unittest.TestCase):
         
         with self.assertRaises(Exception):
             self.scraper._make_request("http://test.com")
-    
+
+    def test_session_leaves_retries_to_scraper(self):
+        """Test that the pooled adapter does not retry on its own"""
+        adapter = self.scraper.session.get_adapter("https://issues.apache.org")
+
+        self.assertEqual(adapter.max_retries.total, 0)
+
     def test_extract_issue_data(self):
         """Test issue data extraction"""
         # Mock issue data
@@ -152,6 +202,117 @@ class TestJiraScraper(unittest.TestCase):
         self.assertEqual(result["comment_count"], 1)
         self.assertEqual(len(result["comments"]), 1)
 
+    def test_extract_issue_data_null_fields(self):
+        """Test extraction when Jira returns null for optional fields"""
+        issue = {
+            "key": "TEST-124",
+            "fields": {
+                "summary": "Null fields",
+                "description": None,
+                "priority": None,
+                "assignee": None,
+                "components": None,
+                "comment": None
+            }
+        }
+        
+        result = self.scraper._extract_issue_data(issue)
+        
+        self.assertEqual(result["priority"], "Unknown")
+        self.assertEqual(result["assignee"], "Unknown")
+        self.assertEqual(result["description"], "")
+        self.assertEqual(result["components"], [])
+        self.assertEqual(result["comment_count"], 0)
+
+    def test_scrape_all_issues_keeps_page_order(self):
+        """Test that concurrently fetched pages are processed in order"""
+        page_size = config.MAX_RESULTS_PER_PAGE
+        total = page_size * 3
+
+        def fake_search(start_at=0):
+            keys = range(start_at, min(start_at + page_size, total))
+            return {
+                "total": total,
+                "issues": [{"key": f"TEST-{i}", "fields": {}} for i in keys]
+            }
+
+        with JiraScraper(self.project) as scraper:
+            with patch.object(scraper, '_get_total', return_value=total), \
+                    patch.object(scraper, '_search_issues', side_effect=fake_search):
+                issues = list(scraper.scrape_all_issues())
+
+        # Raw file is streamed as JSONL, one issue per line
+        with open(scraper.raw_file, 'r', encoding='utf-8') as f:
+            raw_keys = [json.loads(line)["issue_key"] for line in f]
+
+        # Checkpoint records the resume offset, and a new scraper picks it up
+        self.assertEqual(utils.load_checkpoint(self.project)["issues_processed"], total)
+        with JiraScraper(self.project) as resumed:
+            self.assertEqual(resumed.issues_processed, total)
+
+        expected_keys = [f"TEST-{i}" for i in range(total)]
+        self.assertEqual([i["issue_key"] for i in issues], expected_keys)
+        self.assertEqual(raw_keys, expected_keys)
+
+    def test_scrape_all_issues_skips_stored_issues(self):
+        """Test that issues already in the issue store are not scraped again"""
+        issues_page = {
+            "total": 2,
+            "issues": [{"key": "TEST-1", "fields": {}}, {"key": "TEST-2", "fields": {}}]
+        }
+
+        with JiraScraper(self.project) as first:
+            with patch.object(first, '_get_total', return_value=2), \
+                    patch.object(first, '_search_issues', return_value=issues_page):
+                self.assertEqual(len(list(first.scrape_all_issues())), 2)
+
+        # Drop the progress checkpoint so the next run starts from zero
+        for checkpoint_file in self.test_dir.glob("checkpoint_*.json"):
+            checkpoint_file.unlink()
+
+        with JiraScraper(self.project) as second:
+            with patch.object(second, '_get_total', return_value=2), \
+                    patch.object(second, '_search_issues', return_value=issues_page):
+                self.assertEqual(list(second.scrape_all_issues()), [])
+
+        with open(second.raw_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+    def test_incremental_run_after_completed_scrape(self):
+        """Test that a run after a completed scrape only fetches updated issues"""
+        def page(summary):
+            return {
+                "total": 1,
+                "issues": [{
+                    "key": "TEST-1",
+                    "fields": {"summary": summary, "updated": "2024-01-02T10:30:00.000+0000"}
+                }]
+            }
+
+        with JiraScraper(self.project) as first:
+            self.assertFalse(first.refresh)
+            with patch.object(first, '_get_total', return_value=1), \
+                    patch.object(first, '_search_issues', return_value=page("Old title")):
+                list(first.scrape_all_issues())
+
+        with JiraScraper(self.project) as second:
+            self.assertTrue(second.refresh)
+            self.assertIn('AND updated >= "2024/01/01 10:30"', second._search_jql)
+            self.assertTrue(second._search_jql.endswith("ORDER BY created ASC"))
+
+            # Updated issues overwrite the stored copy instead of being skipped
+            with patch.object(second, '_get_total', return_value=1), \
+                    patch.object(second, '_search_issues', return_value=page("New title")):
+                self.assertEqual(len(list(second.scrape_all_issues())), 1)
+
+        raw_issues = list(utils.iter_jsonl(second.raw_file))
+        self.assertEqual([i["title"] for i in raw_issues], ["New title"])
+
+        # --full ignores the checkpoint and walks every issue again
+        with JiraScraper(self.project, full=True) as full:
+            self.assertEqual(full.issues_processed, 0)
+            self.assertTrue(full._search_jql.endswith("ORDER BY created ASC"))
+
 
 class TestDataTransformer(unittest.TestCase):
     """Test data transformation functionality"""
@@ -236,7 +397,32 @@ class TestDataTransformer(unittest.TestCase):
             self.assertIn("input", example)
             self.assertIn("output", example)
             self.assertIn("metadata", example)
-    
+
+    def test_task_metadata_keeps_task_keys_first(self):
+        """Test that task metadata lists the task's own keys before the base metadata"""
+        minimal_issue = {key: self.sample_issue[key] for key in ("issue_key", "project", "url", "title", "status")}
+        task = self.transformer._create_qa_task(minimal_issue)[1]
+        self.assertEqual(list(task["metadata"]), ["issue_key", "project", "question_type", "url"])
+
+        examples = self.transformer.transform_issue(self.sample_issue)
+        qa_status = next(e for e in examples if e["metadata"].get("question_type") == "status")
+        self.assertEqual(list(qa_status["metadata"])[:4], ["issue_key", "project", "question_type", "url"])
+        self.assertEqual(qa_status["metadata"]["created"], self.sample_issue["created"])
+
+    def test_transform_issue_without_title(self):
+        """Test that issues without a key or title produce no examples"""
+        self.assertEqual(self.transformer.transform_issue(dict(self.sample_issue, title="")), [])
+        self.assertEqual(self.transformer.transform_issue({"title": "No key"}), [])
+
+    def test_transform_all_issues_in_processes(self):
+        """Test that transforming in worker processes keeps results and order"""
+        issues = [dict(self.sample_issue, issue_key=f"TEST-{i}") for i in range(100)]
+
+        serial = self.transformer.transform_all_issues(issues)
+        parallel = self.transformer.transform_all_issues(iter(issues), workers=2)
+
+        self.assertEqual(parallel, serial)
+
     def test_generate_statistics(self):
         """Test statistics generation"""
         examples = self.transformer.transform_issue(self.sample_issue)
@@ -246,17 +432,35 @@ class TestDataTransformer(unittest.TestCase):
         self.assertIn("task_type_distribution", stats)
         self.assertEqual(stats["total_examples"], len(examples))
 
+    @patch('transformer._WRITE_BATCH_SIZE', 2)
+    def test_save_to_jsonl(self):
+        """Test that saved examples round-trip across write batches"""
+        examples = self.transformer.transform_issue(self.sample_issue)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            output_file = Path(tmp) / "examples.jsonl"
+            self.transformer.save_to_jsonl(examples, output_file)
+
+            self.assertEqual(list(utils.iter_jsonl(output_file)), examples)
+
 
 class TestEndToEnd(unittest.TestCase):
     """End-to-end integration tests"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.test_dir = Path(tempfile.mkdtemp())
+    @classmethod
+    def setUpClass(cls):
+        """Set up a temporary directory shared by the class"""
+        cls.class_dir = Path(tempfile.mkdtemp())
         
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         """Clean up test fixtures"""
-        shutil.rmtree(self.test_dir, ignore_errors=True)
+        shutil.rmtree(cls.class_dir, ignore_errors=True)
+    
+    def setUp(self):
+        """Give each test its own subdirectory, since tests reuse file names"""
+        self.test_dir = self.class_dir / self._testMethodName
+        self.test_dir.mkdir()
     
     def test_checkpoint_save_load(self):
         """Test checkpoint saving and loading"""
@@ -267,15 +471,29 @@ class TestEndToEnd(unittest.TestCase):
             "last_issue_key": "TEST-100"
         }
         
-        # Save checkpoint
-        filepath = utils.save_checkpoint(project, checkpoint_data)
-        self.assertTrue(filepath.exists())
-        
-        # Load checkpoint
-        loaded_data = utils.load_checkpoint(project)
-        self.assertIsNotNone(loaded_data)
-        self.assertEqual(loaded_data["issues_processed"], 100)
+        with patch.object(config, 'CHECKPOINT_DIR', self.test_dir):
+            # Save checkpoint
+            filepath = utils.save_checkpoint(project, checkpoint_data)
+            self.assertTrue(filepath.exists())
+            
+            # Load checkpoint
+            loaded_data = utils.load_checkpoint(project)
+            self.assertIsNotNone(loaded_data)
+            self.assertEqual(loaded_data["issues_processed"], 100)
     
+    def test_load_checkpoint_picks_newest_by_name(self):
+        """Test that the checkpoint with the latest timestamp in its name is loaded"""
+        with patch.object(config, 'CHECKPOINT_DIR', self.test_dir):
+            for timestamp, processed in [("20240102_000000", 2), ("20240101_235959", 1)]:
+                (self.test_dir / f"checkpoint_TEST_{timestamp}.json").write_text(
+                    json.dumps({"issues_processed": processed})
+                )
+            (self.test_dir / "checkpoint_OTHER_20250101_000000.json").write_text("{}")
+            (self.test_dir / "checkpoint_TEST_BAR_20250101_000000.json").write_text("{}")
+            
+            self.assertEqual(utils.load_checkpoint("TEST")["issues_processed"], 2)
+            self.assertIsNone(utils.load_checkpoint("MISSING"))
+
     def test_jsonl_merge(self):
         """Test JSONL file merging"""
         # Create test JSONL files
@@ -301,6 +519,21 @@ class TestEndToEnd(unittest.TestCase):
         with open(output, 'r') as f:
             lines = f.readlines()
             self.assertEqual(len(lines), 3)
+    
+    def test_jsonl_merge_without_trailing_newline(self):
+        """Test that merging keeps records separate when a file lacks a final newline"""
+        file1 = self.test_dir / "file1.jsonl"
+        file2 = self.test_dir / "file2.jsonl"
+        output = self.test_dir / "merged.jsonl"
+        
+        file1.write_text('{"test": 1}')
+        file2.write_text('{"test": 2}\n')
+        
+        count = utils.merge_jsonl_files([file1, file2], output)
+        
+        self.assertEqual(count, 2)
+        with open(output, 'r') as f:
+            self.assertEqual([json.loads(line) for line in f], [{"test": 1}, {"test": 2}])
 
 
 def run_tests():
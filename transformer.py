@@ -4,37 +4,85 @@ Data Transformer Module - Converts scraped data into LLM training format
 
 import json
 import logging
-from typing import Any, Dict, List
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from typing import Any, Dict, Iterable, List, Optional
 from pathlib import Path
 
-import jsonlines
+import orjson
 from tqdm import tqdm
 
 import config
 import utils
 
+# Number of issues sent to a worker process at a time in transform_all_issues
+_TRANSFORM_CHUNK_SIZE = 64
+
+# Number of examples serialized per write in save_to_jsonl
+_WRITE_BATCH_SIZE = 10000
+
+# Characters of the description quoted in task inputs
+_DESCRIPTION_EXCERPT_LENGTH = 500
+
+# Instruction shared by all question-answering tasks
+_QA_INSTRUCTION = "Answer the following question about this software issue:"
+
+
+def _description_excerpt(issue: Dict[str, Any]) -> str:
+    """Return the start of an issue's description that tasks quote"""
+    return (issue.get("description") or "")[:_DESCRIPTION_EXCERPT_LENGTH]
+
 
 class DataTransformer:
     """
     Transform raw Jira data into structured JSONL format for LLM training
     """
     
-    def __init__(self, project: str):
+    def __init__(self, project: Optional[str] = None):
         """
         Initialize the transformer
         
+        The transformer holds no per-project state, so one instance can be
+        reused across projects by passing the project to transform_all_issues.
+        
         Args:
-            project: Project name
+            project: Default project name, used when none is passed per call
         """
         self.project = project
-        self.logger = logging.getLogger(f"{__name__}.{project}")
+        self.logger = logging.getLogger(f"{__name__}.{project}" if project else __name__)
+    
+    def _base_metadata(self, issue: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the metadata shared by every task created from an issue
+        
+        Args:
+            issue: Issue data
+            
+        Returns:
+            Base metadata dictionary
+        """
+        return {
+            "issue_key": issue["issue_key"],
+            "project": issue["project"],
+            "issue_type": issue["issue_type"],
+            "priority": issue["priority"],
+            "status": issue["status"],
+            "created": issue["created"],
+            "url": issue["url"],
+            "labels": issue.get("labels", []),
+            "components": issue.get("components", [])
+        }
     
-    def _create_summarization_task(self, issue: Dict[str, Any]) -> Dict[str, Any]:
+    def _create_summarization_task(self, issue: Dict[str, Any],
+                                   base_metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Create a summarization task from issue data
         
         Args:
             issue: Issue data
+            base_metadata: Metadata shared by all of the issue's tasks, added
+                after the task's own metadata if given
             
         Returns:
             Summarization task dictionary
@@ -59,23 +107,33 @@ class DataTransformer:
             "metadata": {
                 "issue_key": issue["issue_key"],
                 "project": issue["project"],
-                "url": issue["url"]
+                "url": issue["url"],
+                **(base_metadata or {})
             }
         }
     
-    def _create_classification_task(self, issue: Dict[str, Any]) -> Dict[str, Any]:
+    def _create_classification_task(self, issue: Dict[str, Any],
+                                    base_metadata: Optional[Dict[str, Any]] = None,
+                                    excerpt: Optional[str] = None) -> Dict[str, Any]:
         """
         Create a classification task (predict priority)
         
         Args:
             issue: Issue data
+            base_metadata: Metadata shared by all of the issue's tasks, added
+                after the task's own metadata if given
+            excerpt: First 500 characters of the description (taken from the
+                issue if not given)
             
         Returns:
             Classification task dictionary
         """
+        if excerpt is None:
+            excerpt = _description_excerpt(issue)
+        
         input_text = f"Title: {issue['title']}\n"
-        if issue.get("description"):
-            input_text += f"Description: {issue['description'][:500]}"  # First 500 chars
+        if excerpt:
+            input_text += f"Description: {excerpt}"
         
         return {
             "task_type": "classification",
@@ -86,26 +144,36 @@ class DataTransformer:
                 "issue_key": issue["issue_key"],
                 "project": issue["project"],
                 "issue_type": issue["issue_type"],
-                "url": issue["url"]
+                "url": issue["url"],
+                **(base_metadata or {})
             }
         }
     
-    def _create_status_prediction_task(self, issue: Dict[str, Any]) -> Dict[str, Any]:
+    def _create_status_prediction_task(self, issue: Dict[str, Any],
+                                       base_metadata: Optional[Dict[str, Any]] = None,
+                                       excerpt: Optional[str] = None) -> Dict[str, Any]:
         """
         Create a status prediction task
         
         Args:
             issue: Issue data
+            base_metadata: Metadata shared by all of the issue's tasks, added
+                after the task's own metadata if given
+            excerpt: First 500 characters of the description (taken from the
+                issue if not given)
             
         Returns:
             Status prediction task dictionary
         """
+        if excerpt is None:
+            excerpt = _description_excerpt(issue)
+        
         input_text = f"Issue: {issue['title']}\n"
         input_text += f"Type: {issue['issue_type']}\n"
         input_text += f"Priority: {issue['priority']}\n"
         
-        if issue.get("description"):
-            input_text += f"Description: {issue['description'][:500]}"
+        if excerpt:
+            input_text += f"Description: {excerpt}"
         
         return {
             "task_type": "status_prediction",
@@ -115,73 +183,91 @@ class DataTransformer:
             "metadata": {
                 "issue_key": issue["issue_key"],
                 "project": issue["project"],
-                "url": issue["url"]
+                "url": issue["url"],
+                **(base_metadata or {})
             }
         }
     
-    def _create_qa_task(self, issue: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _create_qa_task(self, issue: Dict[str, Any],
+                        base_metadata: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
         Create question-answering tasks from issue data
         
         Args:
             issue: Issue data
+            base_metadata: Metadata shared by all of the issue's tasks, added
+                after the task's own metadata if given
             
         Returns:
             List of QA task dictionaries
         """
+        # Every question repeats the same issue header
+        title = issue["title"]
+        header = f"Issue Key: {issue['issue_key']}\nTitle: {title}\n"
+        
         qa_tasks = []
         
         # Q1: What is the issue about?
         qa_tasks.append({
             "task_type": "question_answering",
-            "instruction": "Answer the following question about this software issue:",
-            "input": f"Issue Key: {issue['issue_key']}\nTitle: {issue['title']}\nDescription: {issue.get('description', 'N/A')}\n\nQuestion: What is this issue about?",
-            "output": issue['title'],
+            "instruction": _QA_INSTRUCTION,
+            "input": f"{header}Description: {issue.get('description', 'N/A')}\n\nQuestion: What is this issue about?",
+            "output": title,
             "metadata": {
                 "issue_key": issue["issue_key"],
                 "project": issue["project"],
                 "question_type": "summary",
-                "url": issue["url"]
+                "url": issue["url"],
+                **(base_metadata or {})
             }
         })
         
         # Q2: What is the status?
         qa_tasks.append({
             "task_type": "question_answering",
-            "instruction": "Answer the following question about this software issue:",
-            "input": f"Issue Key: {issue['issue_key']}\nTitle: {issue['title']}\n\nQuestion: What is the current status of this issue?",
-            "output": issue['status'],
+            "instruction": _QA_INSTRUCTION,
+            "input": header + "\nQuestion: What is the current status of this issue?",
+            "output": issue["status"],
             "metadata": {
                 "issue_key": issue["issue_key"],
                 "project": issue["project"],
                 "question_type": "status",
-                "url": issue["url"]
+                "url": issue["url"],
+                **(base_metadata or {})
             }
         })
         
         # Q3: Who is assigned?
-        if issue.get("assignee") and issue["assignee"] != "Unknown":
+        assignee = issue.get("assignee")
+        if assignee and assignee != "Unknown":
             qa_tasks.append({
                 "task_type": "question_answering",
-                "instruction": "Answer the following question about this software issue:",
-                "input": f"Issue Key: {issue['issue_key']}\nTitle: {issue['title']}\n\nQuestion: Who is assigned to this issue?",
-                "output": issue["assignee"],
+                "instruction": _QA_INSTRUCTION,
+                "input": header + "\nQuestion: Who is assigned to this issue?",
+                "output": assignee,
                 "metadata": {
                     "issue_key": issue["issue_key"],
                     "project": issue["project"],
                     "question_type": "assignee",
-                    "url": issue["url"]
+                    "url": issue["url"],
+                    **(base_metadata or {})
                 }
             })
         
         return qa_tasks
     
-    def _create_issue_resolution_task(self, issue: Dict[str, Any]) -> Dict[str, Any]:
+    def _create_issue_resolution_task(self, issue: Dict[str, Any],
+                                      base_metadata: Optional[Dict[str, Any]] = None,
+                                      excerpt: Optional[str] = None) -> Dict[str, Any]:
         """
         Create an issue resolution task (if issue has comments showing resolution)
         
         Args:
             issue: Issue data
+            base_metadata: Metadata shared by all of the issue's tasks, added
+                after the task's own metadata if given
+            excerpt: First 500 characters of the description (taken from the
+                issue if not given)
             
         Returns:
             Issue resolution task dictionary or None
@@ -193,9 +279,12 @@ class DataTransformer:
         last_comments = issue["comments"][-2:]
         resolution_context = "\n".join([c["body"] for c in last_comments])
         
+        if excerpt is None:
+            excerpt = _description_excerpt(issue)
+        
         input_text = f"Issue: {issue['title']}\n"
-        if issue.get("description"):
-            input_text += f"Description: {issue['description'][:500]}\n"
+        if excerpt:
+            input_text += f"Description: {excerpt}\n"
         input_text += f"\nHow was this issue resolved?"
         
         return {
@@ -207,7 +296,8 @@ class DataTransformer:
                 "issue_key": issue["issue_key"],
                 "project": issue["project"],
                 "status": issue["status"],
-                "url": issue["url"]
+                "url": issue["url"],
+                **(base_metadata or {})
             }
         }
     
@@ -221,77 +311,87 @@ class DataTransformer:
         Returns:
             List of training examples
         """
+        # Every task is keyed by the issue and built around its title, so an
+        # issue missing either cannot produce a useful example
+        if not issue.get("issue_key") or not issue.get("title"):
+            self.logger.debug("Skipping issue without key or title: %s", issue.get("issue_key", "unknown"))
+            return []
+        
         training_examples = []
         
         try:
-            # Create base metadata for all tasks
-            base_metadata = {
-                "issue_key": issue["issue_key"],
-                "project": issue["project"],
-                "issue_type": issue["issue_type"],
-                "priority": issue["priority"],
-                "status": issue["status"],
-                "created": issue["created"],
-                "url": issue["url"],
-                "labels": issue.get("labels", []),
-                "components": issue.get("components", [])
-            }
+            # Create base metadata once; each task unpacks it after its own keys
+            base_metadata = self._base_metadata(issue)
+            
+            # Several tasks quote the start of the description; slice it once
+            excerpt = _description_excerpt(issue)
             
             # 1. Summarization task
-            if issue.get("description") or issue.get("comments"):
-                summ_task = self._create_summarization_task(issue)
-                summ_task["metadata"].update(base_metadata)
-                training_examples.append(summ_task)
+            if excerpt or issue.get("comments"):
+                training_examples.append(self._create_summarization_task(issue, base_metadata))
             
             # 2. Classification task (priority prediction)
-            if issue.get("title") and issue.get("priority"):
-                class_task = self._create_classification_task(issue)
-                class_task["metadata"].update(base_metadata)
-                training_examples.append(class_task)
+            if issue.get("priority"):
+                training_examples.append(self._create_classification_task(issue, base_metadata, excerpt))
             
             # 3. Status prediction task
-            if issue.get("title") and issue.get("status"):
-                status_task = self._create_status_prediction_task(issue)
-                status_task["metadata"].update(base_metadata)
-                training_examples.append(status_task)
+            if issue.get("status"):
+                training_examples.append(self._create_status_prediction_task(issue, base_metadata, excerpt))
             
             # 4. Question-answering tasks
-            qa_tasks = self._create_qa_task(issue)
-            for qa_task in qa_tasks:
-                qa_task["metadata"].update
-                qa_task["metadata"].update(base_metadata)
-                training_examples.append(qa_task)
+            training_examples.extend(self._create_qa_task(issue, base_metadata))
             
             # 5. Issue resolution task (if applicable)
-            resolution_task = self._create_issue_resolution_task(issue)
+            resolution_task = self._create_issue_resolution_task(issue, base_metadata, excerpt)
             if resolution_task:
-                resolution_task["metadata"].update(base_metadata)
                 training_examples.append(resolution_task)
             
         except Exception as e:
-            self.logger.error(f"Error transforming issue {issue.get('issue_key', 'unknown')}: {str(e)}")
+            self.logger.error("Error transforming issue %s: %s", issue.get('issue_key', 'unknown'), e)
         
         return training_examples
     
-    def transform_all_issues(self, issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def transform_all_issues(self, issues: Iterable[Dict[str, Any]],
+                             project: Optional[str] = None,
+                             workers: int = 1) -> List[Dict[str, Any]]:
         """
         Transform all issues into training examples
         
         Args:
-            issues: List of raw issue data
+            issues: Raw issue data, either a list or a stream such as
+                JiraScraper.scrape_all_issues()
+            project: Project name for progress reporting (defaults to the
+                transformer's project)
+            workers: Number of processes to transform in; issues are
+                transformed in order in this process when 1. More workers
+                read the whole input up front, and pickling issues and
+                examples across processes costs more than transform_issue
+                itself, so this only pays off for much heavier transforms
             
         Returns:
             List of all training examples
         """
         all_examples = []
+        issue_count = 0
         
-        self.logger.info(f"Transforming {len(issues)} issues into training examples...")
+        project = project or self.project
         
-        for issue in tqdm(issues, desc=f"Transforming {self.project}", unit="issue"):
-            examples = self.transform_issue(issue)
-            all_examples.extend(examples)
+        self.logger.info(f"[{project}] Transforming issues into training examples...")
         
-        self.logger.info(f"Created {len(all_examples)} training examples from {len(issues)} issues")
+        with ExitStack() as stack:
+            if workers > 1:
+                # Issues are independent, so they are sent to the workers in
+                # chunks; map still returns the results in input order
+                executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+                results = executor.map(self.transform_issue, issues, chunksize=_TRANSFORM_CHUNK_SIZE)
+            else:
+                results = map(self.transform_issue, issues)
+            
+            for examples in tqdm(results, desc=f"Transforming {project}", unit="issue"):
+                all_examples.extend(examples)
+                issue_count += 1
+        
+        self.logger.info(f"[{project}] Created {len(all_examples)} training examples from {issue_count} issues")
         
         return all_examples
     
@@ -306,9 +406,12 @@ class DataTransformer:
         Returns:
             Path to saved file
         """
-        with jsonlines.open(output_file, mode='w') as writer:
-            for example in examples:
-                writer.write(example)
+        with open(output_file, 'wb') as f:
+            # Serialize in batches so one write covers many records without
+            # holding the whole encoded corpus in memory
+            for start in range(0, len(examples), _WRITE_BATCH_SIZE):
+                batch = examples[start:start + _WRITE_BATCH_SIZE]
+                f.write(b"\n".join([orjson.dumps(example) for example in batch]) + b"\n")
         
         self.logger.info(f"Saved {len(examples)} examples to {output_file} ({utils.get_file_size_mb(output_file):.2f} MB)")
         return str(output_file)
@@ -323,35 +426,16 @@ class DataTransformer:
         Returns:
             Statistics dictionary
         """
+        metadatas = [example.get("metadata", {}) for example in examples]
+        
         stats = {
             "total_examples": len(examples),
-            "task_type_distribution": {},
-            "projects": set(),
-            "issue_types": set(),
-            "priorities": set(),
-            "statuses": set()
+            "task_type_distribution": dict(Counter(example.get("task_type", "unknown") for example in examples)),
+            # Sets are converted to lists for JSON serialization
+            "projects": list({m["project"] for m in metadatas if "project" in m}),
+            "issue_types": list({m["issue_type"] for m in metadatas if "issue_type" in m}),
+            "priorities": list({m["priority"] for m in metadatas if "priority" in m}),
+            "statuses": list({m["status"] for m in metadatas if "status" in m})
         }
         
-        for example in examples:
-            # Task type distribution
-            task_type = example.get("task_type", "unknown")
-            stats["task_type_distribution"][task_type] = stats["task_type_distribution"].get(task_type, 0) + 1
-            
-            # Metadata statistics
-            metadata = example.get("metadata", {})
-            if "project" in metadata:
-                stats["projects"].add(metadata["project"])
-            if "issue_type" in metadata:
-                stats["issue_types"].add(metadata["issue_type"])
-            if "priority" in metadata:
-                stats["priorities"].add(metadata["priority"])
-            if "status" in metadata:
-                stats["statuses"].add(metadata["status"])
-        
-        # Convert sets to lists for JSON serialization
-        stats["projects"] = list(stats["projects"])
-        stats["issue_types"] = list(stats["issue_types"])
-        stats["priorities"] = list(stats["priorities"])
-        stats["statuses"] = list(stats["statuses"])
-        
         return stats
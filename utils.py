@@ -2,12 +2,17 @@
 Utility functions for the scraper
 """
 
-import json
 import logging
+import os
+import shutil
+import threading
 import time
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple
+
+import orjson
 
 import config
 
@@ -24,6 +29,15 @@ def setup_logging(log_file: Path = config.LOG_FILE,
     Returns:
         Configured logger
     """
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    
+    # LOG_FORMAT uses none of the thread, process or caller fields, so skip
+    # collecting them (and the stack walk for the caller) on every record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging._srcfile = None
+    
     logging.basicConfig(
         level=getattr(logging, log_level),
         format=config.LOG_FORMAT,
@@ -53,12 +67,31 @@ def save_checkpoint(project: str, data: Dict[str, Any]) -> Path:
     )
     filepath = config.CHECKPOINT_DIR / filename
     
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    # Write to a temp file and swap it in, so a crash mid-write never
+    # leaves a truncated checkpoint behind
+    tmp_path = filepath.with_suffix(".json.tmp")
+    tmp_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_path, filepath)
     
     return filepath
 
 
+def _is_checkpoint_stamp(text: str) -> bool:
+    """
+    Check that text is exactly a %Y%m%d_%H%M%S checkpoint timestamp
+    
+    Without this, the prefix for project FOO would also match checkpoints of
+    a project FOO_BAR, whose names sort after FOO's own.
+    
+    Args:
+        text: Part of a checkpoint file name between the project and '.json'
+        
+    Returns:
+        True if text is a checkpoint timestamp
+    """
+    return len(text) == 15 and text[8] == "_" and text.replace("_", "").isdigit()
+
+
 def load_checkpoint(project: str) -> Optional[Dict[str, Any]]:
     """
     Load the most recent checkpoint for a project
@@ -69,16 +102,36 @@ def load_checkpoint(project: str) -> Optional[Dict[str, Any]]:
     Returns:
         Checkpoint data or None if no checkpoint exists
     """
-    checkpoint_files = list(config.CHECKPOINT_DIR.glob(f"checkpoint_{project}_*.json"))
+    prefix = f"checkpoint_{project}_"
+    try:
+        with os.scandir(config.CHECKPOINT_DIR) as entries:
+            checkpoint_names = [
+                entry.name for entry in entries
+                if entry.name.startswith(prefix) and entry.name.endswith(".json")
+                and _is_checkpoint_stamp(entry.name[len(prefix):-len(".json")])
+            ]
+    except FileNotFoundError:
+        return None
     
-    if not checkpoint_files:
+    if not checkpoint_names:
         return None
     
-    # Get most recent checkpoint
-    latest_checkpoint = max(checkpoint_files, key=lambda p: p.stat().st_mtime)
+    # Get most recent checkpoint; the fixed-width %Y%m%d_%H%M%S timestamp in
+    # the name sorts chronologically, so no stat calls are needed
+    latest_checkpoint = config.CHECKPOINT_DIR / max(checkpoint_names)
     
-    with open(latest_checkpoint, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return orjson.loads(latest_checkpoint.read_bytes())
+
+
+# Texts up to this length go through the normalization cache; longer ones
+# (full descriptions) are almost never repeated and would only bloat it
+_CACHEABLE_TEXT_LENGTH = 1024
+
+
+@lru_cache(maxsize=4096)
+def _normalize_whitespace_cached(text: str) -> str:
+    """Cached whitespace normalization for short, often repeated texts"""
+    return " ".join(text.split())
 
 
 def clean_text(text: Optional[str], max_length: Optional[int] = None) -> str:
@@ -95,10 +148,14 @@ def clean_text(text: Optional[str], max_length: Optional[int] = None) -> str:
     if not text:
         return ""
     
-    # Remove excessive whitespace
-    text = " ".join(text.split())
+    # Remove excessive whitespace (short texts such as titles and bot
+    # comments repeat across issues, so those are memoized)
+    if len(text) <= _CACHEABLE_TEXT_LENGTH:
+        text = _normalize_whitespace_cached(text)
+    else:
+        text = " ".join(text.split())
     
-    # Truncate if needed
+    # Truncate if needed (kept outside the cache so max_length is not part of its key)
     if max_length and len(text) > max_length:
         text = text[:max_length] + "..."
     
@@ -118,7 +175,8 @@ def extract_user_info(user_obj: Optional[Dict[str, Any]]) -> str:
     if not user_obj:
         return "Unknown"
     
-    return user_obj.get("displayName", user_obj.get("name", "Unknown"))
+    # Fall through empty or null names rather than returning them
+    return user_obj.get("displayName") or user_obj.get("name") or "Unknown"
 
 
 def format_timestamp(timestamp: Optional[str]) -> str:
@@ -141,6 +199,35 @@ def format_timestamp(timestamp: Optional[str]) -> str:
         return ""
 
 
+def parse_timestamp(timestamp: Optional[str]) -> Optional[datetime]:
+    """
+    Parse a Jira timestamp such as '2024-01-01T00:00:00.000+0000'
+    
+    Args:
+        timestamp: Jira timestamp string
+        
+    Returns:
+        Timezone-aware datetime, or None if missing or malformed
+    """
+    if not timestamp:
+        return None
+    
+    try:
+        return datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%S.%f%z")
+    except ValueError:
+        return None
+
+
+# Longest backoff between retries, in seconds
+_MAX_SLEEP_TIME = 60
+
+# Backoff for the configured factor, precomputed for the first 64 retries
+_DEFAULT_SLEEP_TIMES = tuple(
+    min(config.RETRY_BACKOFF_FACTOR ** retry_count, _MAX_SLEEP_TIME)
+    for retry_count in range(64)
+)
+
+
 def calculate_sleep_time(retry_count: int, 
                         backoff_factor: int = config.RETRY_BACKOFF_FACTOR) -> float:
     """
@@ -153,13 +240,117 @@ def calculate_sleep_time(retry_count: int,
     Returns:
         Sleep time in seconds
     """
-    return min(backoff_factor ** retry_count, 60)  # Cap at 60 seconds
+    if backoff_factor == config.RETRY_BACKOFF_FACTOR and 0 <= retry_count < len(_DEFAULT_SLEEP_TIMES):
+        return _DEFAULT_SLEEP_TIMES[retry_count]
+    
+    return min(backoff_factor ** retry_count, _MAX_SLEEP_TIME)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter
+    
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    Each request takes one token; callers that find the bucket empty reserve
+    the next token and sleep until it is due, so concurrent callers are
+    served in order.
+    """
+    
+    def __init__(self, rate: float, capacity: int):
+        """
+        Initialize the bucket, starting full
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> float:
+        """
+        Take one token, sleeping the minimum time needed for it to be available
+        
+        Returns:
+            Time slept in seconds
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            self.tokens -= 1
+            wait_time = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
+
+
+# Block size for file copies and line counting
+_COPY_BUFFER_SIZE = 1 << 20
+
+
+def _copy_file(infile: BinaryIO, outfile: BinaryIO, size: int) -> None:
+    """
+    Copy a whole file, kernel-to-kernel with sendfile where the OS supports it
+    
+    Args:
+        infile: Source file opened in binary mode
+        outfile: Unbuffered destination file opened in binary mode
+        size: Number of bytes to copy
+    """
+    try:
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(outfile.fileno(), infile.fileno(), offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+        return
+    except (AttributeError, OSError):
+        # sendfile is unavailable (non-Linux) or unsupported for these files;
+        # nothing has been written yet if it failed on the first call
+        if offset:
+            raise
+    
+    infile.seek(0)
+    shutil.copyfileobj(infile, outfile, length=_COPY_BUFFER_SIZE)
+
+
+def _count_lines(infile: BinaryIO) -> Tuple[int, bool]:
+    """
+    Count lines in a file without decoding it
+    
+    Args:
+        infile: File opened in binary mode
+        
+    Returns:
+        Tuple of (line count, whether the file ends with a newline)
+    """
+    infile.seek(0)
+    newlines = 0
+    last_byte = b""
+    
+    while True:
+        chunk = infile.read(_COPY_BUFFER_SIZE)
+        if not chunk:
+            break
+        newlines += chunk.count(b"\n")
+        last_byte = chunk[-1:]
+    
+    ends_with_newline = last_byte in (b"\n", b"")
+    return newlines + (0 if ends_with_newline else 1), ends_with_newline
 
 
 def merge_jsonl_files(input_files: list, output_file: Path) -> int:
     """
     Merge multiple JSONL files into one
     
+    Files are concatenated as raw bytes rather than line by line.
+    
     Args:
         input_files: List of input file paths
         output_file: Output file path
@@ -169,19 +360,43 @@ def merge_jsonl_files(input_files: list, output_file: Path) -> int:
     """
     count = 0
     
-    with open(output_file, 'w', encoding='utf-8') as outfile:
+    with open(output_file, 'wb', buffering=0) as outfile:
         for input_file in input_files:
             if not input_file.exists():
                 continue
                 
-            with open(input_file, 'r', encoding='utf-8') as infile:
-                for line in infile:
-                    outfile.write(line)
-                    count += 1
+            with open(input_file, 'rb') as infile:
+                size = os.fstat(infile.fileno()).st_size
+                if not size:
+                    continue
+                
+                _copy_file(infile, outfile, size)
+                lines, ends_with_newline = _count_lines(infile)
+                count += lines
+                
+                # Keep the next file's first record on its own line
+                if not ends_with_newline:
+                    outfile.write(b"\n")
     
     return count
 
 
+def iter_jsonl(filepath: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Stream records from a JSONL file one line at a time
+    
+    Args:
+        filepath: Path to JSONL file
+        
+    Yields:
+        Parsed record for each non-empty line
+    """
+    with open(filepath, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield orjson.loads(line)
+
+
 def get_file_size_mb(filepath: Path) -> float:
     """
     Get file size in megabytes
@@ -209,7 +424,13 @@ def validate_json_structure(data: Dict[str, Any], required_fields: list) -> bool
     Returns:
         True if valid, False otherwise
     """
-    return all(field in data for field in required_fields)
+    # A keys view compares against the set directly; issubset(data) would
+    # first copy every key of the dict into a temporary set
+    return data.keys() >= frozenset(required_fields)
+
+
+# Characters that are invalid in filenames, each mapped to '_'
+_SANITIZE_TABLE = str.maketrans({char: '_' for char in '<>:"/\\|?*'})
 
 
 def sanitize_filename(filename: str) -> str:
@@ -222,7 +443,4 @@ def sanitize_filename(filename: str) -> str:
     Returns:
         Sanitized filename
     """
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        filename = filename.replace(char, '_')
-    return filename
\ No newline at end of file
+    return filename.translate(_SANITIZE_TABLE)
\ No newline at end of file